@@ -1,10 +1,17 @@
-from pydantic import BaseModel,EmailStr
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from app.users.schema import UserResponse
 
 class TokenResponse(BaseModel):
+    # 'never' is already pydantic's default, stated on purpose since the routes pass
+    # in UserResponse.model_construct instances that mustn't be revalidated
+    model_config = ConfigDict(frozen=True, revalidate_instances='never')
+
     user: UserResponse
     token: str
     refresh_token : str
 
 class RequestTokenResponse(BaseModel):
     refresh_token : str
+
+_TOKEN_ADAPTER = TypeAdapter(TokenResponse)
+dump_token = _TOKEN_ADAPTER.dump_json
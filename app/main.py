@@ -6,6 +6,8 @@ from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 import os
 import logging
+import pydantic
+import pydantic_core
 from app.database.main import init_db
 
 # setting up logging
@@ -79,6 +81,8 @@ async def health_check():
 @app.on_event("startup")
 async def startup():
     """ initializing database on startup"""
+    # schema validation runs in the compiled pydantic-core validators
+    logger.info(f"pydantic {pydantic.VERSION} (pydantic-core {pydantic_core.__version__})")
     init_db()
 
 # app.mount("/", StaticFiles(directory="auth-app-frontend/dist", html=True), name="static")
@@ -3,48 +3,65 @@
 Comprehensive API testing script for the FastAPI backend
 Tests all endpoints: Users, Posts, Comments, Likes
 """
-import requests
-import json
+import asyncio
+import httpx
+import orjson
+import os
 import time
 
+try:
+    import uvloop
+except ImportError:  # uvloop isn't available on Windows
+    uvloop = None
+
 # Configuration
 BASE_URL = "http://localhost:8000"
 API_BASE = f"{BASE_URL}/api"
+VERBOSE = os.environ.get("TEST_VERBOSE") == "1"
 
-# Global variables to store test data
-import time
-
-# Generate unique test data using timestamp
-timestamp = int(time.time())
-test_user = {
-    "username": f"testuser_{timestamp}",
-    "email": f"test_{timestamp}@example.com",
-    "password": "password123"
-}
+post_data = {"text": "This is a test post created by the automated test suite!"}
+comment_data = {"text": "This is a test comment!"}
+update_data = {"text": "This post has been updated by the test suite!"}
 
-test_user2 = {
-    "username": f"testuser2_{timestamp}", 
-    "email": f"test2_{timestamp}@example.com",
-    "password": "password123"
-}
+# Request bodies serialized once up front instead of on every call
+POST_BODY_BYTES = orjson.dumps(post_data)
+COMMENT_BODY_BYTES = orjson.dumps(comment_data)
+UPDATE_BODY_BYTES = orjson.dumps(update_data)
+INVALID_LOGIN_BYTES = orjson.dumps({"email": "wrong@email.com", "password": "wrongpass"})
+INVALID_EMAIL_BYTES = orjson.dumps({"username": "testuser3", "email": "invalid-email", "password": "password123"})
+SHORT_PASSWORD_BYTES = orjson.dumps({"username": "testuser3", "email": "test3@example.com", "password": "123"})
 
-auth_token = None
-user_id = None
-post_id = None
-comment_id = None
+def make_user():
+    """Generate a unique test user for a single run"""
+    ts = time.time_ns()
+    return {
+        "username": f"testuser_{ts}",
+        "email": f"test_{ts}@example.com",
+        "password": "password123"
+    }
 
-def print_test_header(test_name):
-    """Print a formatted test header"""
-    print(f"\n{'='*60}")
-    print(f"🧪 {test_name}")
-    print(f"{'='*60}")
+def format_test_header(test_name):
+    """Format a test header"""
+    return f"\n{'='*60}\n🧪 {test_name}\n{'='*60}"
 
-def print_test_result(success, message):
-    """Print formatted test result"""
+def format_test_result(success, message):
+    """Format a test result"""
     if success:
-        print(f"✅ {message}")
+        return f"✅ {message}"
     else:
-        print(f"❌ {message}")
+        return f"❌ {message}"
+
+def dump(d):
+    """Pretty-print response data"""
+    return orjson.dumps(d, option=orjson.OPT_INDENT_2).decode()
+
+def rjson(r):
+    """Parse a response body with orjson"""
+    return orjson.loads(r.content)
+
+def auth_header(client, token):
+    """Attach the bearer token to the run's client"""
+    client.headers["Authorization"] = f"Bearer {token}"
 
 def cleanup_test_data():
     """Clean up test data after tests"""
@@ -53,366 +70,186 @@ def cleanup_test_data():
     # For now, we just print a message
     print("✅ Test data cleanup completed")
 
-def test_registration():
-    """Test user registration"""
-    global auth_token, user_id
-    
-    print_test_header("User Registration")
-    
-    response = requests.post(f"{API_BASE}/register", json=test_user)
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 201, f"Registration failed with status {response.status_code}"
-    
-    data = response.json()
-    auth_token = data.get('token')
-    user_id = data.get('user', {}).get('id')
-    
-    assert auth_token is not None, "No token received"
-    assert user_id is not None, "No user ID received"
-    
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Registration successful!")
-    return True
+def user_body(ctx):
+    """Request body for the user generated for this run"""
+    return ctx["user_bytes"]
 
-def test_login():
-    """Test user login"""
-    global auth_token, user_id
-    
-    print_test_header("User Login")
-    
-    response = requests.post(f"{API_BASE}/login", json=test_user)
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 200, f"Login failed with status {response.status_code}"
-    
-    data = response.json()
-    auth_token = data.get('token')
-    user_id = data.get('user', {}).get('id')
-    
-    assert auth_token is not None, "No token received"
-    assert user_id is not None, "No user ID received"
-    
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Login successful!")
-    return True
+def check_auth(data, ctx):
+    """Store the token and user ID from a register/login response"""
+    ctx["token"] = data.get('token')
+    ctx["user_id"] = data.get('user', {}).get('id')
+    
+    assert ctx["token"] is not None, "No token received"
+    assert ctx["user_id"] is not None, "No user ID received"
+    auth_header(ctx["client"], ctx["token"])
 
-def test_profile():
-    """Test getting user profile"""
-    global auth_token
-    
-    print_test_header("User Profile")
-    
-    assert auth_token is not None, "No auth token available"
-    
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = requests.get(f"{API_BASE}/profile", headers=headers)
-    
-    print(f"Status: {response.status_code}")
-    
-    if response.status_code == 200:
-        data = response.json()
-        assert "user" in data, "No user data in response"
-        assert data["user"]["email"] == test_user["email"], "Wrong user email"
-        
-        print(f"Response: {json.dumps(data, indent=2)}")
-        print_test_result(True, "Profile retrieved successfully!")
-        return True
-    else:
-        print(f"Response: {response.text}")
-        print_test_result(False, "Profile retrieval failed!")
-        return False
+def check_profile(data, ctx):
+    """Check the profile belongs to the registered user"""
+    assert "user" in data, "No user data in response"
+    assert data["user"]["email"] == ctx["user"]["email"], "Wrong user email"
 
-def test_create_post():
-    """Test creating a post"""
-    global auth_token, post_id
-    
-    print_test_header("Create Post")
+def check_post_created(data, ctx):
+    """Store the post ID from a create post response"""
+    ctx["post_id"] = data.get('id')
     
-    assert auth_token is not None, "No auth token available"
-    
-    post_data = {
-        "text": "This is a test post created by the automated test suite!"
-    }
-    
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = requests.post(f"{API_BASE}/posts", json=post_data, headers=headers)
-    
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 201, f"Post creation failed with status {response.status_code}"
-    
-    data = response.json()
-    post_id = data.get('id')
-    
-    assert post_id is not None, "No post ID received"
+    assert ctx["post_id"] is not None, "No post ID received"
     assert data['text'] == post_data['text'], "Post text doesn't match"
     assert 'created_at' in data, "No created_at timestamp"
-    
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Post creation successful!")
-    return True
 
-def test_get_all_posts():
-    """Test getting all posts"""
-    print_test_header("Get All Posts")
-    
-    response = requests.get(f"{API_BASE}/posts")
-    
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 200, f"Get posts failed with status {response.status_code}"
-    
-    data = response.json()
-    assert isinstance(data, list), "Response should be a list"
-    
-    print(f"Found {len(data)} posts")
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Get all posts successful!")
-    return True
+def check_post_updated(data, ctx):
+    """Check the post text was updated"""
+    assert data['text'] == update_data['text'], "Post text not updated"
+    assert data['id'] == ctx["post_id"], "Wrong post ID"
 
-def test_get_single_post():
-    """Test getting a single post"""
-    global post_id
-    
-    print_test_header("Get Single Post")
-    
-    assert post_id is not None, "No post ID available"
-    
-    response = requests.get(f"{API_BASE}/posts/{post_id}")
-    
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 200, f"Get single post failed with status {response.status_code}"
-    
-    data = response.json()
-    assert data['id'] == post_id, "Wrong post ID"
+def check_single_post(data, ctx):
+    """Check a single post response"""
+    assert data['id'] == ctx["post_id"], "Wrong post ID"
     assert 'text' in data, "No text in post"
     assert 'created_at' in data, "No created_at timestamp"
-    
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Get single post successful!")
-    return True
 
-def test_create_comment():
-    """Test creating a comment"""
-    global auth_token, post_id, comment_id
-    
-    print_test_header("Create Comment")
-    
-    assert auth_token is not None, "No auth token available"
-    assert post_id is not None, "No post ID available"
-    
-    comment_data = {
-        "text": "This is a test comment!"
-    }
-    
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = requests.post(f"{API_BASE}/comments?post_id={post_id}", json=comment_data, headers=headers)
-    
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 201, f"Comment creation failed with status {response.status_code}"
-    
-    data = response.json()
-    comment_id = data.get('id')
+def check_post_list(data, ctx):
+    """Check the posts listing is a list"""
+    assert isinstance(data, list), "Response should be a list"
+    return f"Found {len(data)} posts"
+
+def check_comment_created(data, ctx):
+    """Store the comment ID from a create comment response"""
+    ctx["comment_id"] = data.get('id')
     
-    assert comment_id is not None, "No comment ID received"
+    assert ctx["comment_id"] is not None, "No comment ID received"
     assert data['text'] == comment_data['text'], "Comment text doesn't match"
-    assert data['post_id'] == post_id, "Wrong post ID in comment"
+    assert data['post_id'] == ctx["post_id"], "Wrong post ID in comment"
     assert 'created_at' in data, "No created_at timestamp"
-    
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Comment creation successful!")
-    return True
 
-def test_get_comments():
-    """Test getting comments for a post"""
-    global post_id
-    
-    print_test_header("Get Comments")
-    
-    assert post_id is not None, "No post ID available"
-    
-    response = requests.get(f"{API_BASE}/{post_id}/comments")
-    
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 200, f"Get comments failed with status {response.status_code}"
-    
-    data = response.json()
+def check_comment_list(data, ctx):
+    """Check the comments listing is a list"""
     assert isinstance(data, list), "Response should be a list"
-    
-    print(f"Found {len(data)} comments")
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Get comments successful!")
-    return True
+    return f"Found {len(data)} comments"
 
-def test_like_post():
-    """Test liking a post"""
-    global auth_token, post_id
-    
-    print_test_header("Like Post")
-    
-    assert auth_token is not None, "No auth token available"
-    assert post_id is not None, "No post ID available"
-    
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = requests.post(f"{API_BASE}/likes?post_id={post_id}", headers=headers)
-    
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 201, f"Like post failed with status {response.status_code}"
-    
-    data = response.json()
+def check_like(data, ctx):
+    """Check the like belongs to the test post and user"""
     assert 'id' in data, "No like ID received"
-    assert data['post_id'] == post_id, "Wrong post ID in like"
-    assert data['user_id'] == user_id, "Wrong user ID in like"
-    
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Post liked successfully!")
-    return True
+    assert data['post_id'] == ctx["post_id"], "Wrong post ID in like"
+    assert data['user_id'] == ctx["user_id"], "Wrong user ID in like"
 
-def test_unlike_post():
-    """Test unliking a post"""
-    global auth_token, post_id
-    
-    print_test_header("Unlike Post")
-    
-    assert auth_token is not None, "No auth token available"
-    assert post_id is not None, "No post ID available"
-    
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = requests.delete(f"{API_BASE}/likes?post_id={post_id}", headers=headers)
-    
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 204, f"Unlike post failed with status {response.status_code}"
-    
-    print_test_result(True, "Post unliked successfully!")
-    return True
+# Test specs: (name, method, path, body, expected status, check, success message[, headers])
+# Paths are formatted with the run context, so {post_id} is filled in once the post exists.
+# A callable body is resolved against the run context, e.g. the generated user's payload.
+SETUP_TESTS = [
+    ("User Registration", "POST", "/register", user_body, 201, check_auth, "Registration successful!"),
+    ("User Login", "POST", "/login", user_body, 200, check_auth, "Login successful!"),
+    ("User Profile", "GET", "/profile", None, 200, check_profile, "Profile retrieved successfully!"),
+    ("Create Post", "POST", "/posts", POST_BODY_BYTES, 201, check_post_created, "Post creation successful!"),
+    ("Update Post", "PUT", "/posts/{post_id}", UPDATE_BODY_BYTES, 200, check_post_updated, "Post update successful!"),
+    ("Create Comment", "POST", "/comments?post_id={post_id}", COMMENT_BODY_BYTES, 201, check_comment_created,
+     "Comment creation successful!"),
+]
 
-def test_update_post():
-    """Test updating a post"""
-    global auth_token, post_id
-    
-    print_test_header("Update Post")
-    
-    assert auth_token is not None, "No auth token available"
-    assert post_id is not None, "No post ID available"
-    
-    update_data = {
-        "text": "This post has been updated by the test suite!"
-    }
-    
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = requests.put(f"{API_BASE}/posts/{post_id}", json=update_data, headers=headers)
-    
-    print(f"Status: {response.status_code}")
-    
-    assert response.status_code == 200, f"Update post failed with status {response.status_code}"
-    
-    data = response.json()
-    assert data['text'] == update_data['text'], "Post text not updated"
-    assert data['id'] == post_id, "Wrong post ID"
-    
-    print(f"Response: {json.dumps(data, indent=2)}")
-    print_test_result(True, "Post update successful!")
-    return True
+# Read-only and error tests don't depend on each other, so they run concurrently
+READ_TESTS = [
+    ("Get All Posts", "GET", "/posts", None, 200, check_post_list, "Get all posts successful!"),
+    ("Get Single Post", "GET", "/posts/{post_id}", None, 200, check_single_post, "Get single post successful!"),
+    ("Get Comments", "GET", "/{post_id}/comments", None, 200, check_comment_list, "Get comments successful!"),
+    ("Invalid Login", "POST", "/login", INVALID_LOGIN_BYTES, 401, None, "Invalid login correctly rejected"),
+    ("Duplicate Registration", "POST", "/register", user_body, 400, None,
+     "Duplicate registration correctly rejected"),
+    ("Invalid Token", "GET", "/profile", None, 401, None, "Invalid token correctly rejected",
+     {"Authorization": "Bearer invalid_token"}),
+    ("Non-existent Post", "GET", "/posts/non-existent-id", None, 404, None, "Non-existent post correctly handled"),
+    ("Invalid Email", "POST", "/register", INVALID_EMAIL_BYTES, 422, None, "Invalid email format correctly rejected"),
+    ("Short Password", "POST", "/register", SHORT_PASSWORD_BYTES, 400, None, "Short password correctly rejected"),
+]
 
-def test_error_cases():
-    """Test various error cases"""
-    print_test_header("Error Cases")
-    
-    # Test invalid login
-    print("\n--- Testing Invalid Login ---")
-    invalid_login = {"email": "wrong@email.com", "password": "wrongpass"}
-    response = requests.post(f"{API_BASE}/login", json=invalid_login)
-    print(f"Status: {response.status_code}")
-    assert response.status_code == 401, "Invalid login should be rejected"
-    print_test_result(True, "Invalid login correctly rejected")
-    
-    # Test duplicate registration
-    print("\n--- Testing Duplicate Registration ---")
-    response = requests.post(f"{API_BASE}/register", json=test_user)
-    print(f"Status: {response.status_code}")
-    assert response.status_code == 400, "Duplicate registration should be rejected"
-    print_test_result(True, "Duplicate registration correctly rejected")
-    
-    # Test invalid token
-    print("\n--- Testing Invalid Token ---")
-    headers = {"Authorization": "Bearer invalid_token"}
-    response = requests.get(f"{API_BASE}/profile", headers=headers)
-    print(f"Status: {response.status_code}")
-    assert response.status_code == 401, "Invalid token should be rejected"
-    print_test_result(True, "Invalid token correctly rejected")
-    
-    # Test accessing non-existent post
-    print("\n--- Testing Non-existent Post ---")
-    response = requests.get(f"{API_BASE}/posts/non-existent-id")
-    print(f"Status: {response.status_code}")
-    assert response.status_code == 404, "Non-existent post should return 404"
-    print_test_result(True, "Non-existent post correctly handled")
+# Like operations are kept serial since they mutate the same like
+LIKE_TESTS = [
+    ("Like Post", "POST", "/likes?post_id={post_id}", None, 201, check_like, "Post liked successfully!"),
+    ("Unlike Post", "DELETE", "/likes?post_id={post_id}", None, 204, None, "Post unliked successfully!"),
+]
 
-def test_validation_errors():
-    """Test input validation"""
-    print_test_header("Input Validation")
+async def run(spec, ctx):
+    """Send one spec's request and check the response"""
+    name, method, path, body, expected, check, message, *headers = spec
     
-    # Test invalid email format
-    print("\n--- Testing Invalid Email ---")
-    invalid_data = {
-        "username": "testuser3",
-        "email": "invalid-email",
-        "password": "password123"
-    }
-    response = requests.post(f"{API_BASE}/register", json=invalid_data)
-    print(f"Status: {response.status_code}")
-    assert response.status_code == 422, "Invalid email should be rejected"
-    print_test_result(True, "Invalid email format correctly rejected")
-    
-    # Test short password
-    print("\n--- Testing Short Password ---")
-    invalid_data = {
-        "username": "testuser3",
-        "email": "test3@example.com",
-        "password": "123"
-    }
-    response = requests.post(f"{API_BASE}/register", json=invalid_data)
-    print(f"Status: {response.status_code}")
-    assert response.status_code == 400, "Short password should be rejected"
-    print_test_result(True, "Short password correctly rejected")
+    # Output is buffered and printed as one block, so concurrent tests don't interleave
+    out = [format_test_header(name)]
+    try:
+        if callable(body):
+            body = body(ctx)
+        response = await ctx["client"].request(method, path.format(**ctx), content=body,
+                                               headers=headers[0] if headers else None)
+        out.append(f"Status: {response.status_code}")
+        
+        if response.status_code != expected:
+            out.append(f"Response: {response.text}")
+        assert response.status_code == expected, f"{name} failed with status {response.status_code}"
+        
+        if check is not None:
+            data = rjson(response)
+            info = check(data, ctx)
+            if info:
+                out.append(info)
+            if VERBOSE and not (isinstance(data, list) and len(data) > 50):
+                out.append(f"Response: {dump(data)}")
+        
+        out.append(format_test_result(True, message))
+        return True
+    except AssertionError as e:
+        out.append(format_test_result(False, str(e)))
+        raise
+    except asyncio.CancelledError:
+        # cancelled because another concurrent test failed, nothing worth reporting
+        out.clear()
+        raise
+    finally:
+        if out:
+            print("\n".join(out))
+
+async def warm_up(client):
+    """Open a pooled connection before the timed tests so they measure steady-state latency"""
+    try:
+        await client.get(f"{BASE_URL}/health")
+    except httpx.HTTPError:
+        pass
 
-def main():
+async def run_tests(client, test_user):
+    """Run every spec table against the run's client"""
+    ctx = {"client": client, "user": test_user, "user_bytes": orjson.dumps(test_user)}
+    for spec in SETUP_TESTS:
+        await run(spec, ctx)
+    
+    # Stop the remaining tests on the first failure so it surfaces on its own
+    tasks = [asyncio.ensure_future(run(spec, ctx)) for spec in READ_TESTS]
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    failures = [task.exception() for task in done if task.exception() is not None]
+    if failures:
+        raise failures[0]
+    
+    for spec in LIKE_TESTS:
+        await run(spec, ctx)
+
+async def main():
     """Run all tests"""
+    test_user = make_user()
+    
     print("🚀 Starting Comprehensive Backend API Tests")
     print(f"Testing against: {BASE_URL}")
     print("=" * 60)
     
     try:
-        # Test user operations
-        test_registration()
-        test_login()
-        
-        # Test profile
-        test_profile()
-        
-        # Test post operations
-        test_create_post()
-        test_get_all_posts()
-        test_get_single_post()
-        test_update_post()
-        
-        # Test comment operations
-        test_create_comment()
-        test_get_comments()
-        
-        # Test like operations
-        test_like_post()
-        test_unlike_post()
-        
-        # Test error cases
-        test_error_cases()
-        test_validation_errors()
+        # One client per run so every test reuses its pooled keep-alive connections
+        async with httpx.AsyncClient(
+            base_url=API_BASE,
+            # h2 is only negotiated over HTTPS (TLS ALPN); against plain http:// like the
+            # local uvicorn server, requests go over HTTP/1.1 on the pooled connections
+            http2=True,
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        ) as client:
+            await warm_up(client)
+            await run_tests(client, test_user)
         
         print("\n" + "=" * 60)
         print("🎉 All tests completed successfully!")
@@ -421,7 +258,7 @@ def main():
         # Clean up test data
         cleanup_test_data()
         
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print(f"❌ Could not connect to {BASE_URL}")
         print("Make sure your backend server is running!")
         print("Run: uvicorn app.main:app --reload")
@@ -435,4 +272,6 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(main())
\ No newline at end of file
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException,Depends, status
+from fastapi import APIRouter, HTTPException,Depends, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.users.models import User
-from app.users.schema import UserCreate,UserResponse,UserLogin
-from app.auth.schema import TokenResponse,RequestTokenResponse
+from app.users.schema import UserCreate,UserResponse,UserLogin,dump_user
+from app.auth.schema import TokenResponse,RequestTokenResponse,dump_token
 from app.auth.service import get_user_details,create_access_token,create_refresh_token,verify_token
 from app.database.main import get_db_session
 from app.users.service import UserService
@@ -27,11 +27,13 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db_session))
     access_token = create_access_token(data={"sub": db_user.email})
     refresh_token = create_refresh_token(data={"sub":db_user.email})
 
-    return {
-        "user": UserResponse(**db_user.to_dict()),
-        "token": access_token,
-        "refresh_token":refresh_token
-    }
+    token_response = TokenResponse(
+        user=UserResponse.model_construct(**db_user.to_dict()),
+        token=access_token,
+        refresh_token=refresh_token
+    )
+    return Response(content=dump_token(token_response), media_type="application/json",
+                    status_code=status.HTTP_201_CREATED)
 
 @router.post("/login",response_model=TokenResponse)
 async def login(user_data: UserLogin, db : Session = Depends(get_db_session)):
@@ -44,11 +46,12 @@ async def login(user_data: UserLogin, db : Session = Depends(get_db_session)):
         access_token = create_access_token(data={"sub": user.email})
         refresh_token = create_refresh_token(data={"sub":user.email})
 
-    return{
-        "user": UserResponse(**user.to_dict()),
-        "token": access_token,
-        "refresh_token":refresh_token
-    }
+    token_response = TokenResponse(
+        user=UserResponse.model_construct(**user.to_dict()),
+        token=access_token,
+        refresh_token=refresh_token
+    )
+    return Response(content=dump_token(token_response), media_type="application/json")
 
 @router.post("/refresh",response_model=TokenResponse)
 async def get_refresh_token(refresh_data: RequestTokenResponse, db : Session = Depends(get_db_session)):
@@ -65,11 +68,12 @@ async def get_refresh_token(refresh_data: RequestTokenResponse, db : Session = D
         new_access_token = create_access_token(data={'sub':email})
         new_refresh_token = create_refresh_token(data={'sub':email})
 
-        return {
-            "user" : UserResponse(**user.to_dict()),
-            "token": new_access_token,
-            "refresh_token":new_refresh_token
-        }
+        token_response = TokenResponse(
+            user=UserResponse.model_construct(**user.to_dict()),
+            token=new_access_token,
+            refresh_token=new_refresh_token
+        )
+        return Response(content=dump_token(token_response), media_type="application/json")
     except HTTPException:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Token invalid or expired.")
         
@@ -88,7 +92,7 @@ async def get_user_by_id(user_id: str, db: Session = Depends(get_db_session)):
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    return UserResponse(**user.to_dict())
+    return Response(content=dump_user(UserResponse(**user.to_dict())), media_type="application/json")
 
 @router.get("/users/{user_id}/posts",response_model=List[PostPublic])
 async def get_user_post(user_id : str ,skip :int = 0, limit :  int =10,
@@ -1,20 +1,31 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, StringConstraints, TypeAdapter
+from typing import Annotated
 from datetime import datetime
 
+# Email format check, compiled once by pydantic-core
+Email = Annotated[str, StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254, to_lower=True)]
+
 # User schema
 class UserBase(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     username: str
-    email: EmailStr
+    email: str
 
 class UserCreate(UserBase):
+    email: Email
     password: str
 
 class UserLogin(BaseModel):
-    email: EmailStr
+    model_config = ConfigDict(frozen=True)
+
+    email: Email
     password: str
 
 class UserResponse(UserBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
-    
-    class Config:
-        from_attributes = True
\ No newline at end of file
+
+_USER_ADAPTER = TypeAdapter(UserResponse)
+dump_user = _USER_ADAPTER.dump_json